@@ -7,14 +7,298 @@ Author: Amit Geller
 Date: 2024-XX-XX
 """
 
+import io
 import os
-import tempfile
+import zipfile
+from xml.sax.saxutils import quoteattr
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; plots are only written to files
 import matplotlib.pyplot as plt
 import seaborn as sns
 import calendar
-from openpyxl import Workbook, load_workbook
-from openpyxl.drawing.image import Image as XLImage
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, rolling_mean falls back to pandas
+    njit = None
+
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# A 16 inch figure at 300 dpi is ~4800 px wide, more points than this are never visible
+MAX_PLOT_POINTS = 5000
+
+# Embedded images are shown at 900x400 px in Excel; 16 in * 60 dpi renders ~960 px wide
+EMBED_DPI = 60
+
+
+def decimate(x, y, max_points=MAX_PLOT_POINTS):
+    """Stride-sample sorted x/y arrays down to roughly max_points samples for plotting."""
+    if len(x) <= max_points:
+        return x, y
+    step = len(x) // max_points
+    return x[::step], y[::step]
+
+
+def _rolling_mean_kernel(values, window):
+    """Trailing mean over `window` samples that skips NaNs, like rolling(window, min_periods=1).mean()."""
+    out = np.empty_like(values)
+    total = 0.0
+    count = 0
+    for i in range(values.size):
+        v = values[i]
+        if v == v:
+            total += v
+            count += 1
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                total -= old
+                count -= 1
+        out[i] = total / count if count > 0 else np.nan
+    return out
+
+
+if njit is not None:
+    _rolling_mean_kernel = njit(cache=True)(_rolling_mean_kernel)
+
+
+def rolling_mean(values, window=10):
+    """Rolling mean of a float64 array, JIT-compiled when numba is installed."""
+    if njit is None:
+        return pd.Series(values).rolling(window=window, min_periods=1).mean().to_numpy()
+    return _rolling_mean_kernel(values, window)
+
+
+def load_excel(path):
+    """
+    Read one location's Excel file (.xlsx or .xls) into a DataFrame using the calamine engine.
+    The parsed data is cached in a Parquet file next to the source and reused while it is newer
+    than the Excel file.
+    """
+    cache = os.path.splitext(path)[0] + '.parquet'
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        return pd.read_parquet(cache, engine='pyarrow')
+    df = pd.read_excel(path, engine='calamine')
+    try:
+        df.to_parquet(cache, engine='pyarrow')
+    except Exception as e:
+        # e.g. a column mixing numbers and text; the frame is still usable, it just isn't cached
+        print(f"Warning: could not cache {path} as {cache}: {e}")
+        if os.path.exists(cache):
+            os.remove(cache)  # don't leave a partial cache that looks newer than the Excel file
+    return df
+
+
+def style_flow_axes(ax, title, handles=None):
+    """
+    Apply the shared title, labels, legend, grid and spine styling to a flow plot.
+    handles restricts the legend to the given artists (default: every labelled artist).
+    """
+    ax.set_title(title, fontsize=18, pad=20)
+    ax.set_xlabel('DateTime', fontsize=14)
+    ax.set_ylabel('Flow', fontsize=14)
+    if handles is None:
+        ax.legend(fontsize=12, frameon=False)
+    else:
+        ax.legend(handles=handles, fontsize=12, frameon=False)
+    ax.grid(True, which='major', axis='both', linestyle='-', linewidth=0.5, alpha=0.3)
+    # Remove top and right spines for a cleaner look
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+
+_figure = None
+
+
+def get_flow_axes():
+    """Return this process's reusable flow figure and axes, cleared for a new plot."""
+    global _figure
+    if _figure is None:
+        _figure, _ = plt.subplots(figsize=(16, 6))
+    ax = _figure.axes[0]
+    ax.cla()
+    return _figure, ax
+
+
+_month_axes = None
+
+
+def get_month_axes(line_styles):
+    """
+    Return this process's reusable monthly figure, axes and one Line2D per location.
+    line_styles maps each location to its (label, color); the lines are created once
+    and later updated with set_data instead of being re-plotted.
+    """
+    global _month_axes
+    if _month_axes is None:
+        fig, ax = plt.subplots(figsize=(16, 6))
+        ax.xaxis_date()  # The empty lines carry no dates, so set the date converter up front
+        lines = {
+            location: ax.plot([], [], label=label, color=color, linewidth=1)[0]
+            for location, (label, color) in line_styles.items()
+        }
+        _month_axes = fig, ax, lines
+    return _month_axes
+
+
+def figure_to_png(fig, dpi=EMBED_DPI):
+    """Encode a figure as PNG in memory and return the bytes."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+
+def render_month(month, loc_dict, line_styles):
+    """
+    Plot all locations for one month. Returns (month_str, png_bytes).
+    loc_dict maps each location to its (datetimes, smoothed flow) arrays for the month;
+    locations without data that month are hidden.
+    """
+    fig, ax, lines = get_month_axes(line_styles)
+    for location, line in lines.items():
+        if location in loc_dict:
+            line.set_data(*decimate(*loc_dict[location]))
+            line.set_visible(True)
+        else:
+            line.set_visible(False)
+    ax.relim(visible_only=True)
+    ax.autoscale_view()
+    visible_lines = [line for line in lines.values() if line.get_visible()]
+    style_flow_axes(ax, f'Water Flow at Jerusalem Supply Locations - {month}', handles=visible_lines)
+    fig.tight_layout()
+    return str(month), figure_to_png(fig)
+
+
+def render_location(i, english_location, x, y, colors):
+    """Plot the full smoothed time series of one location. Returns (english_location, png_bytes)."""
+    fig, ax = get_flow_axes()
+    x, y = decimate(x, y)
+    ax.plot(x, y, label=english_location, color=colors[i % len(colors)], linewidth=1)
+    style_flow_axes(ax, f'Water Flow at {english_location}')
+    fig.tight_layout()
+    return english_location, figure_to_png(fig)
+
+
+def render_window(thursday_start, saturday_start, windows, colors):
+    """
+    Plot one Thursday-Saturday window and return the PNG bytes.
+    windows is a list of (color_index, english_location, df_window) tuples.
+    """
+    fig, ax = get_flow_axes()
+    for i, english_location, df_window in windows:
+        # Smooth within the window so values don't carry in from before Thursday
+        flow_smooth = rolling_mean(df_window['Flow'].to_numpy(np.float64))
+        ax.plot(df_window['DateTime'], flow_smooth, label=english_location, color=colors[i % len(colors)], linewidth=1)
+    title_str = f'Water Flow ({thursday_start.strftime("%Y-%m-%d %H:%M")} to {saturday_start.strftime("%Y-%m-%d %H:%M")})'
+    style_flow_axes(ax, title_str)
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+
+# OOXML namespaces and relationship types used by write_image_workbook
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_NS_XDR = 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing'
+_NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_EMU_PER_PX = 9525
+
+
+def _relationships_xml(targets, rel_type):
+    """Build a .rels part pointing rId1..rIdN at the given targets."""
+    rels = ''.join(
+        f'<Relationship Id="rId{i}" Type="{_NS_REL}/{rel_type}" Target="{target}"/>'
+        for i, target in enumerate(targets, start=1)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_NS_PKG_REL}">{rels}</Relationships>'
+
+
+def _drawing_xml(first_image_id, image_count, width_px, height_px, row_step):
+    """Build a drawing part that stacks image_count pictures in column A, row_step rows apart."""
+    cx, cy = width_px * _EMU_PER_PX, height_px * _EMU_PER_PX
+    anchors = []
+    for j in range(image_count):
+        pic_id = first_image_id + j
+        anchors.append(
+            f'<xdr:oneCellAnchor>'
+            f'<xdr:from><xdr:col>0</xdr:col><xdr:colOff>0</xdr:colOff><xdr:row>{j * row_step}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from>'
+            f'<xdr:ext cx="{cx}" cy="{cy}"/>'
+            f'<xdr:pic><xdr:nvPicPr><xdr:cNvPr id="{pic_id}" name="Image {pic_id}"/>'
+            f'<xdr:cNvPicPr><a:picLocks noChangeAspect="1"/></xdr:cNvPicPr></xdr:nvPicPr>'
+            f'<xdr:blipFill><a:blip r:embed="rId{j + 1}"/><a:stretch><a:fillRect/></a:stretch></xdr:blipFill>'
+            f'<xdr:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></xdr:spPr></xdr:pic>'
+            f'<xdr:clientData/></xdr:oneCellAnchor>'
+        )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<xdr:wsDr xmlns:xdr="{_NS_XDR}" xmlns:a="{_NS_A}" xmlns:r="{_NS_REL}">{"".join(anchors)}</xdr:wsDr>'
+    )
+
+
+def write_image_workbook(excel_path, sheets, width_px=900, height_px=400, row_step=22):
+    """
+    Write an .xlsx containing only images, one sheet per (sheet_name, [png_bytes, ...]) entry.
+    The package parts are generated directly so the already-encoded PNGs are stored as-is,
+    without openpyxl/PIL re-opening and re-encoding every picture.
+    """
+    content_types = [
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    ]
+    sheet_entries = []
+    image_count = 0
+    with zipfile.ZipFile(excel_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for n, (sheet_name, pngs) in enumerate(sheets, start=1):
+            sheet_entries.append(f'<sheet name={quoteattr(str(sheet_name))} sheetId="{n}" r:id="rId{n}"/>')
+            content_types.append(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            )
+            drawing_ref = ''
+            if pngs:
+                drawing_ref = '<drawing r:id="rId1"/>'
+                media = []
+                for png in pngs:
+                    image_count += 1
+                    media.append(f'../media/image{image_count}.png')
+                    # PNG data is already compressed, store it without deflating again
+                    zf.writestr(f'xl/media/image{image_count}.png', png, compress_type=zipfile.ZIP_STORED)
+                zf.writestr(f'xl/drawings/drawing{n}.xml',
+                            _drawing_xml(image_count - len(pngs) + 1, len(pngs), width_px, height_px, row_step))
+                zf.writestr(f'xl/drawings/_rels/drawing{n}.xml.rels', _relationships_xml(media, 'image'))
+                zf.writestr(f'xl/worksheets/_rels/sheet{n}.xml.rels',
+                            _relationships_xml([f'../drawings/drawing{n}.xml'], 'drawing'))
+                content_types.append(
+                    f'<Override PartName="/xl/drawings/drawing{n}.xml" '
+                    f'ContentType="application/vnd.openxmlformats-officedocument.drawing+xml"/>'
+                )
+            zf.writestr(
+                f'xl/worksheets/sheet{n}.xml',
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheetData/>{drawing_ref}</worksheet>'
+            )
+        zf.writestr(
+            'xl/workbook.xml',
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>{"".join(sheet_entries)}</sheets></workbook>'
+        )
+        zf.writestr('xl/_rels/workbook.xml.rels',
+                    _relationships_xml([f'worksheets/sheet{n}.xml' for n in range(1, len(sheets) + 1)], 'worksheet'))
+        zf.writestr('_rels/.rels', _relationships_xml(['xl/workbook.xml'], 'officeDocument'))
+        zf.writestr(
+            '[Content_Types].xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Default Extension="png" ContentType="image/png"/>'
+            f'{"".join(content_types)}</Types>'
+        )
 
 
 def main():
@@ -30,16 +314,47 @@ def main():
     ]
     print("Excel files found:", excel_files)
     
-    # Read each Excel file into a DataFrame and store in a dict
+    # Read the Excel files concurrently, then process each DataFrame and store it in a dict
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(excel_files)))) as executor:
+        raw_dfs = list(executor.map(load_excel, [os.path.join(data_dir, f) for f in excel_files]))
     dfs = {}
-    for file in excel_files:
+    for file, df in zip(excel_files, raw_dfs):
         location_name = os.path.splitext(file)[0]
-        df = pd.read_excel(os.path.join(data_dir, file))
-        dfs[location_name] = df
         print(f"\n--- {location_name} ---")
         print("Columns:", df.columns.tolist())
         print(df.head())
-    
+        if not ('Date' in df.columns and 'Time' in df.columns and 'Flow' in df.columns):
+            print(f"Required columns not found in {location_name}: {df.columns.tolist()}")
+            continue
+        # Build DateTime, smoothed flow and month once; every plot below reuses them
+        df['DateTime'] = pd.to_datetime(
+            df['Date'].astype(str).values + ' ' + df['Time'].astype(str).values,
+            format='%Y-%m-%d %H:%M:%S', errors='coerce'
+        )
+        # Sorted once here; everything below (groupby, rolling, month offsets, searchsorted) relies on it
+        df = df.sort_values('DateTime', kind='stable', ignore_index=True)
+        # float32 is plenty for plotting flow and halves the memory the smoothing/grouping walk over
+        df['Flow'] = pd.to_numeric(df['Flow'], errors='coerce', downcast='float')
+        df['Flow_smooth'] = df['Flow'].rolling(window=10, min_periods=1).mean()
+        df['Month'] = df['DateTime'].dt.to_period('M')
+        # Monthly plots smooth within each month so the curve doesn't carry over month boundaries
+        if df['DateTime'].notna().any():
+            df['Flow_smooth_month'] = (
+                df.groupby('Month', sort=False)['Flow'].rolling(window=10, min_periods=1).mean()
+                .reset_index(level=0, drop=True)
+            )
+        else:
+            # No parsable dates means no months to group by; the location gets no monthly plots
+            print(f"No valid Date/Time values in {location_name}, skipping its monthly smoothing")
+            df['Flow_smooth_month'] = np.nan
+        # Keep only the derived columns the plots use; Date/Time strings and any extras are dropped
+        dfs[location_name] = df[['DateTime', 'Month', 'Flow', 'Flow_smooth', 'Flow_smooth_month']].copy()
+
+    if not dfs:
+        print("No Excel files with Date, Time and Flow columns found.")
+        return
+
+
     # Mapping for Hebrew to English location names
     hebrew_to_english = {
         'חלילים': 'Halilim',
@@ -48,204 +363,106 @@ def main():
         'עין כרם': 'Ein cerem',
         # Add more mappings as needed
     }
+    # Map each location name to English once, falling back to the original name
+    english_names = {
+        loc: next((eng for heb, eng in hebrew_to_english.items() if heb in loc), loc)
+        for loc in dfs
+    }
+
+    # Directory to save the Excel report
+    save_dir = r"C:\Users\AmitGeller\Desktop\Yaron Geller\אספקת מים לעיר ירושלים"
+    excel_path = os.path.join(save_dir, "water_supply_monthly_plots.xlsx")
 
-    plt.figure(figsize=(16, 6))
+    fig, ax = get_flow_axes()
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
+    # Each location keeps the same label and color in every monthly plot
+    line_styles = {loc: (english_names[loc], colors[i % len(colors)]) for i, loc in enumerate(dfs)}
 
+    # Single pass over the locations: draw the overview, queue the individual plot and
+    # split the location into month slices (found from month boundaries, not group copies)
+    individual_jobs = []
+    for_month = {}
     for i, (location, df) in enumerate(dfs.items()):
-        # Map location name to English if possible
-        english_location = location
-        for heb, eng in hebrew_to_english.items():
-            if heb in location:
-                english_location = eng
-                break
-        if 'Date' in df.columns and 'Time' in df.columns and 'Flow' in df.columns:
-            df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
-            df_sorted = df.sort_values('DateTime')
-            df_sorted['Flow_smooth'] = df_sorted['Flow'].rolling(window=10, min_periods=1).mean()
-            plt.plot(df_sorted['DateTime'], df_sorted['Flow_smooth'], label=english_location, color=colors[i % len(colors)], linewidth=1)
-        else:
-            print(f"Required columns not found in {location}: {df.columns.tolist()}")
+        dt_values = df['DateTime'].values
+        smooth_values = df['Flow_smooth'].values
+        ax.plot(*decimate(dt_values, smooth_values), label=english_names[location], color=colors[i % len(colors)], linewidth=1)
+        individual_jobs.append((i, english_names[location], dt_values, smooth_values))
 
-    plt.title('Water Flow at Jerusalem Supply Locations', fontsize=18, pad=20)
-    plt.xlabel('DateTime', fontsize=14)
-    plt.ylabel('Flow', fontsize=14)
-    plt.legend(fontsize=12, frameon=False)
-    plt.grid(True, which='major', axis='both', linestyle='-', linewidth=0.5, alpha=0.3)
+        n_valid = int(df['DateTime'].notna().sum())  # NaT rows sort to the end
+        if n_valid == 0:
+            continue
+        month_ordinals = df['Month'].array.asi8[:n_valid]
+        month_smooth = df['Flow_smooth_month'].values
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(month_ordinals)) + 1, [n_valid]))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            for_month.setdefault(df['Month'].iloc[lo], {})[location] = (dt_values[lo:hi], month_smooth[lo:hi])
 
-    # Remove top and right spines for a cleaner look
-    ax = plt.gca()
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-    plt.tight_layout()
-    plt.savefig(r"C:\Users\AmitGeller\Desktop\Yaron Geller\אספקת מים לעיר ירושלים\water_supply_plot.png", dpi=300)
+    style_flow_axes(ax, 'Water Flow at Jerusalem Supply Locations')
+    fig.tight_layout()
+    fig.savefig(os.path.join(save_dir, "water_supply_plot.png"), dpi=300)
     # plt.show()
 
-    # Directory to save images and Excel
-    save_dir = r"C:\Users\AmitGeller\Desktop\Yaron Geller\אספקת מים לעיר ירושלים"
-    excel_path = os.path.join(save_dir, "water_supply_monthly_plots.xlsx")
-    
-    # Prepare a dict to hold monthly images
-    month_images = {}
-    
-    # Combine all DateTime and Flow data for each location
-    for_month = {}
-    for location, df in dfs.items():
-        if 'Date' in df.columns and 'Time' in df.columns and 'Flow' in df.columns:
-            df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
-            df_sorted = df.sort_values('DateTime')
-            df_sorted['Flow_smooth'] = df_sorted['Flow'].rolling(window=10, min_periods=1).mean()
-            df_sorted['Month'] = df_sorted['DateTime'].dt.to_period('M')
-            for month, group in df_sorted.groupby('Month'):
-                if month not in for_month:
-                    for_month[month] = {}
-                for_month[month][location] = group
-    
-    # For each month, plot all locations
-    for month, loc_dict in for_month.items():
-        plt.figure(figsize=(16, 6))
-        for i, (location, df) in enumerate(loc_dict.items()):
-            # Map location name to English if possible
-            english_location = location
-            for heb, eng in hebrew_to_english.items():
-                if heb in location:
-                    english_location = eng
-                    break
-            plt.plot(df['DateTime'], df['Flow_smooth'], label=english_location, color=colors[i % len(colors)], linewidth=1)
-        plt.title(f'Water Flow at Jerusalem Supply Locations - {month}', fontsize=18, pad=20)
-        plt.xlabel('DateTime', fontsize=14)
-        plt.ylabel('Flow', fontsize=14)
-        plt.legend(fontsize=12, frameon=False)
-        plt.grid(True, which='major', axis='both', linestyle='-', linewidth=0.5, alpha=0.3)
-        ax = plt.gca()
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        plt.tight_layout()
-        img_path = os.path.join(save_dir, f'water_supply_{month}.png')
-        plt.savefig(img_path, dpi=300)
-        plt.close()
-        month_images[str(month)] = img_path
-    
-    # Save all images to Excel
-    wb = Workbook()
-    for i, (month, img_path) in enumerate(month_images.items()):
-        if i == 0:
-            ws = wb.active
-            ws.title = str(month)
-        else:
-            ws = wb.create_sheet(str(month))
-        img = XLImage(img_path)
-        img.width = 900
-        img.height = 400
-        ws.add_image(img, 'A1')
-    wb.save(excel_path)
-    print(f"Saved all monthly graphs to {excel_path}")
-
-    # Individual plots for each location (full time series)
-    individual_images = {}
-    for i, (location, df) in enumerate(dfs.items()):
-        # Map location name to English if possible
-        english_location = location
-        for heb, eng in hebrew_to_english.items():
-            if heb in location:
-                english_location = eng
-                break
-        if 'Date' in df.columns and 'Time' in df.columns and 'Flow' in df.columns:
-            df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
-            df_sorted = df.sort_values('DateTime')
-            df_sorted['Flow_smooth'] = df_sorted['Flow'].rolling(window=10, min_periods=1).mean()
-            plt.figure(figsize=(16, 6))
-            plt.plot(df_sorted['DateTime'], df_sorted['Flow_smooth'], label=english_location, color=colors[i % len(colors)], linewidth=1)
-            plt.title(f'Water Flow at {english_location}', fontsize=18, pad=20)
-            plt.xlabel('DateTime', fontsize=14)
-            plt.ylabel('Flow', fontsize=14)
-            plt.legend(fontsize=12, frameon=False)
-            plt.grid(True, which='major', axis='both', linestyle='-', linewidth=0.5, alpha=0.3)
-            ax = plt.gca()
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            plt.tight_layout()
-            img_path = os.path.join(save_dir, f'water_supply_{english_location}.png')
-            plt.savefig(img_path, dpi=300)
-            plt.close()
-            individual_images[english_location] = img_path
-        else:
-            print(f"Required columns not found in {location}: {df.columns.tolist()}")
-
-    # Add individual plots to Excel
-    wb = load_workbook(excel_path)
-    for location, img_path in individual_images.items():
-        ws = wb.create_sheet(location)
-        img = XLImage(img_path)
-        img.width = 900
-        img.height = 400
-        ws.add_image(img, 'A1')
-    wb.save(excel_path)
-    print(f"Added individual location plots to {excel_path}")
+    month_jobs = [(month, for_month[month]) for month in sorted(for_month)]
 
     # --- New: Plot 4 consecutive Thursday 00:00 to Saturday 00:00 (48 hours) windows ---
-    # Gather all unique Thursdays in the data
-    all_datetimes = []
-    for df in dfs.values():
-        if 'Date' in df.columns and 'Time' in df.columns:
-            dt = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
-            all_datetimes.extend(dt.dropna().tolist())
-    all_datetimes = sorted(set(all_datetimes))
-    thursdays = [dt for dt in all_datetimes if dt.weekday() == 3 and dt.hour == 0 and dt.minute == 0]
-    thursdays = sorted(set(thursdays))
-    # Only keep unique Thursdays
-    thursdays = [dt for i, dt in enumerate(thursdays) if i == 0 or (dt - thursdays[i-1]).days >= 7]
-    # Take up to 4 windows
-    thursdays = thursdays[:4]
-    thurs_sat_imgs = []
-    for idx, thursday_start in enumerate(thursdays):
+    # Enumerate the Thursdays (00:00) covered by the data from its overall date range,
+    # ignoring unparsed dates; without any valid dates there are no windows
+    valid_dts = [df['DateTime'].dropna() for df in dfs.values()]
+    valid_dts = [dt for dt in valid_dts if not dt.empty]
+    if valid_dts:
+        data_start = min(dt.min() for dt in valid_dts).normalize()
+        data_end = max(dt.max() for dt in valid_dts).normalize()
+        # Take up to 4 windows
+        thursdays = pd.date_range(data_start, data_end, freq='W-THU')[:4]
+    else:
+        print("No valid Date/Time values found, skipping the Thursday-Saturday windows")
+        thursdays = []
+    # Frames are sorted by DateTime, so each window is a contiguous slice found by binary search
+    dt_arrays = {location: df['DateTime'].values for location, df in dfs.items()}
+    window_jobs = []
+    for thursday_start in thursdays:
         saturday_start = thursday_start + pd.Timedelta(days=2)
-        plt.figure(figsize=(16, 6))
+        windows = []
         for i, (location, df) in enumerate(dfs.items()):
-            # Map location name to English if possible
-            english_location = location
-            for heb, eng in hebrew_to_english.items():
-                if heb in location:
-                    english_location = eng
-                    break
-            if 'Date' in df.columns and 'Time' in df.columns and 'Flow' in df.columns:
-                df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
-                mask = (df['DateTime'] >= thursday_start) & (df['DateTime'] < saturday_start)
-                df_window = df.loc[mask].sort_values('DateTime')
-                if not df_window.empty:
-                    df_window['Flow_smooth'] = df_window['Flow'].rolling(window=10, min_periods=1).mean()
-                    plt.plot(df_window['DateTime'], df_window['Flow_smooth'], label=english_location, color=colors[i % len(colors)], linewidth=1)
-        title_str = f'Water Flow ({thursday_start.strftime("%Y-%m-%d %H:%M")} to {saturday_start.strftime("%Y-%m-%d %H:%M")})'
-        plt.title(title_str, fontsize=18, pad=20)
-        plt.xlabel('DateTime', fontsize=14)
-        plt.ylabel('Flow', fontsize=14)
-        plt.legend(fontsize=12, frameon=False)
-        plt.grid(True, which='major', axis='both', linestyle='-', linewidth=0.5, alpha=0.3)
-        ax = plt.gca()
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        plt.tight_layout()
-        # Save to a temporary file for Excel insertion, then delete after
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmpfile:
-            plt.savefig(tmpfile.name, dpi=300)
-            thurs_sat_imgs.append(tmpfile.name)
-        plt.close()
-    # Add all 4 graphs to a new sheet in the Excel file
-    wb = load_workbook(excel_path)
-    ws = wb.create_sheet('Thurs-Sat Windows')
-    row = 1
-    for img_path in thurs_sat_imgs:
-        img = XLImage(img_path)
-        img.width = 900
-        img.height = 400
-        ws.add_image(img, f'A{row}')
-        row += 22
-    wb.save(excel_path)
-    # Now delete temp files
-    for img_path in thurs_sat_imgs:
-        os.remove(img_path)
-    print(f"Added 4 Thursday-Saturday window graphs to {excel_path}")
+            lo = np.searchsorted(dt_arrays[location], thursday_start.to_datetime64())
+            hi = np.searchsorted(dt_arrays[location], saturday_start.to_datetime64())
+            df_window = df.iloc[lo:hi][['DateTime', 'Flow']]
+            if not df_window.empty:
+                windows.append((i, english_names[location], df_window))
+        window_jobs.append((thursday_start, saturday_start, windows))
+
+    # Rendering and PNG encoding are CPU-bound and independent, so run them in parallel
+    # (no more workers than plots, and Windows allows at most 61 worker processes)
+    n_tasks = len(month_jobs) + len(individual_jobs) + len(window_jobs)
+    with ProcessPoolExecutor(max_workers=min(n_tasks, os.cpu_count() or 1, 61)) as executor:
+        month_results = executor.map(
+            render_month,
+            [month for month, _ in month_jobs], [loc_dict for _, loc_dict in month_jobs],
+            repeat(line_styles)
+        )
+        individual_results = executor.map(
+            render_location,
+            *zip(*individual_jobs),
+            repeat(colors)
+        )
+        window_results = executor.map(
+            render_window,
+            [job[0] for job in window_jobs], [job[1] for job in window_jobs], [job[2] for job in window_jobs],
+            repeat(colors)
+        )
+        month_images = dict(month_results)
+        individual_images = dict(individual_results)
+        thurs_sat_imgs = list(window_results)
+    plt.close(fig)
+    
+    # Collect every sheet with its images, then build and save the workbook in a single pass
+    # The PNGs are embedded straight from memory, only the overview plot is kept on disk
+    sheets = [(month, [png]) for month, png in month_images.items()]
+    sheets += [(location, [png]) for location, png in individual_images.items()]
+    if thurs_sat_imgs:
+        sheets.append(('Thurs-Sat Windows', thurs_sat_imgs))
+    write_image_workbook(excel_path, sheets)
+    print(f"Saved monthly, individual location and Thursday-Saturday window graphs to {excel_path}")
 
 
 if __name__ == "__main__":
@@ -1,277 +1,333 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to files
 import matplotlib.pyplot as plt
+from PIL import Image
 import seaborn as sns
 from datetime import datetime
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Plot style is set once at import; charts use fixed layouts and are cropped when saved
+plt.style.use('default')
+plt.rcParams.update({'figure.autolayout': False, 'savefig.bbox': 'tight'})
 
 def read_data(file_paths):
     """
-    Read multiple CSV files and combine them
+    Read multiple CSV files with PyArrow's multithreaded reader and combine them.
+    The tables are concatenated in Arrow and converted to pandas (Arrow-backed dtypes) once.
     """
-    dfs = []
-    for file_path in file_paths:
-        df = pd.read_csv(file_path)
-        dfs.append(df)
-    return pd.concat(dfs, ignore_index=True)
+    read_options = pacsv.ReadOptions(use_threads=True)
+    # Keep Date and Time as text; process_data builds DateTime from them
+    convert_options = pacsv.ConvertOptions(column_types={'Date': pa.string(), 'Time': pa.string()})
+    tables = [pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+              for file_path in file_paths]
+    table = pa.concat_tables(tables, promote_options='default')
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
 
 def process_data(df):
     """
     Process the data:
     1. Convert date and time columns to datetime
-    2. Extract day of week and time components
-    3. Filter for Mondays and Saturdays only
+    2. Filter for Mondays and Saturdays only and clean invalid measurements (one combined filter)
+    3. Extract day of week and time components
     4. Add daytime flag
-    5. Clean invalid measurements
     """
-    # Convert to datetime
-    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'])
+    # Convert to datetime: parse the dates with a fixed format and add the times as offsets,
+    # so no combined "Date Time" string column is built
+    dates = pd.to_datetime(df['Date'], format='%Y-%m-%d', cache=True)
+    times = pd.to_timedelta(df['Time'])
+    df['DateTime'] = dates + times
+    
+    # Get the water level column
+    level_column = '/4sewage/bialik/balik007/level (m)'
+    
+    # Keep Mondays (0) and Saturdays (5) with reasonable water levels, in a single copy
+    dow = df['DateTime'].dt.dayofweek.to_numpy()
+    lvl = df[level_column].to_numpy(dtype=float, na_value=np.nan)
+    mask = np.isin(dow, [0, 5]) & (lvl >= 0) & (lvl <= 10)
+    df = df.loc[mask].copy()
+    # Levels are bounded in [0, 10]; float32 halves the memory every reduction has to scan
+    df[level_column] = df[level_column].astype(np.float32)
+    # Keep rows in time order (the monthly files normally already are)
+    if not df['DateTime'].is_monotonic_increasing:
+        df = df.sort_values('DateTime', kind='stable')
     
-    # Extract components
+    # Extract components (only for the rows that were kept)
     df['DayOfWeek'] = df['DateTime'].dt.dayofweek
     df['DayName'] = df['DateTime'].dt.day_name()
     df['Hour'] = df['DateTime'].dt.hour
-    df['Month'] = df['DateTime'].dt.strftime('%Y-%m')
-    
-    # Filter for Mondays (0) and Saturdays (5) only
-    df = df[df['DayOfWeek'].isin([0, 5])]
+    df['Month'] = df['DateTime'].dt.to_period('M')  # Integer-backed; str(period) gives 'YYYY-MM'
     
     # Add daytime flag (08:00-15:00)
     df['IsDaytime'] = df['Hour'].between(8, 14)  # 14 to include all of hour 14 (until 15:00)
     
-    # Get the water level column
-    level_column = '/4sewage/bialik/balik007/level (m)'
-    
-    # Clean invalid measurements
-    df = df[df[level_column].between(0, 10)]  # Keep only reasonable water levels
+    # Categorical day names make every DayName groupby use integer codes instead of hashing strings
+    df['DayName'] = pd.Categorical(df['DayName'], categories=['Monday', 'Saturday'])
     
     return df, level_column
 
+def _round3(table):
+    """
+    Round a statistics table to 3 decimals, widening float32 columns first
+    so the rounded values are exact in the printout and in Excel
+    """
+    return table.astype({col: 'float64' for col in table.select_dtypes('float32').columns}).round(3)
+
 def analyze_data(df, level_column):
     """
     Perform detailed analysis of Monday vs Saturday data
     """
     # Overall statistics by day
-    stats = df.groupby('DayName')[level_column].agg([
+    by_day = df.groupby('DayName', observed=True)[level_column]
+    stats = by_day.agg([
         'count',
         'mean',
         'median',
         'std',
         'min',
-        'max',
-        lambda x: x.quantile(0.25).round(3),
-        lambda x: x.quantile(0.75).round(3)
-    ]).round(3)
-    stats.columns = ['Count', 'Mean', 'Median', 'Std', 'Min', 'Max', '25th Percentile', '75th Percentile']
+        'max'
+    ])
+    stats.columns = ['Count', 'Mean', 'Median', 'Std', 'Min', 'Max']
+    # Quartiles in one vectorized call instead of per-group lambdas
+    quartiles = by_day.quantile([0.25, 0.75]).unstack()
+    quartiles.columns = ['25th Percentile', '75th Percentile']
+    stats = _round3(stats.join(quartiles))
     
     # Daytime statistics
-    daytime_stats = df[df['IsDaytime']].groupby('DayName')[level_column].agg([
+    daytime_stats = _round3(df[df['IsDaytime']].groupby('DayName', observed=True)[level_column].agg([
         'count',
         'mean',
         'median',
         'std',
         'min',
         'max'
-    ]).round(3)
+    ]))
     daytime_stats.columns = ['Count', 'Mean', 'Median', 'Std', 'Min', 'Max']
     
     # Monthly statistics
-    monthly_stats = df.groupby(['Month', 'DayName'])[level_column].agg([
+    monthly_stats = _round3(df.groupby(['Month', 'DayName'], observed=True)[level_column].agg([
         'count',
         'mean',
         'std'
-    ]).round(3)
+    ]))
     
     # Hourly patterns
-    hourly_stats = df.groupby(['DayName', 'Hour'])[level_column].agg(['mean', 'std']).round(3)
+    hourly_stats = _round3(df.groupby(['DayName', 'Hour'], observed=True)[level_column].agg(['mean', 'std']))
     
     return stats, daytime_stats, monthly_stats, hourly_stats
 
-def create_visualizations(df, level_column, save_dir):
+def _new_chart(fig, width, height):
+    """
+    Clear the shared figure, resize it and return a fresh single axes
+    """
+    fig.clf()
+    fig.set_size_inches(width, height)
+    return fig.add_subplot(111)
+
+def _plot_month(month, monday_data, saturday_data, level_column, save_dir):
     """
-    Create detailed visualizations comparing Mondays and Saturdays
+    Draw the charts of one month (the Monday/Saturday daily means and each day's
+    actual values) and return their paths. Runs in a worker process, so it uses
+    its own figure and only receives that month's rows.
     """
-    plt.style.use('default')
     chart_paths = []
+    # Shared y-axis range for all charts of this month
+    day_levels = [data[level_column] for data in (monday_data, saturday_data) if not data.empty]
+    y_min = min(levels.min() for levels in day_levels)
+    y_max = max(levels.max() for levels in day_levels)
+    # 5. Monthly line graphs (means)
+    fig = plt.figure(figsize=(20, 7))
+    ax1, ax2 = fig.subplots(1, 2)
+    # Monday means
+    monday_daily = monday_data.groupby(monday_data['DateTime'].dt.day.rename('DayOfMonth'), observed=True)[level_column].agg(['mean', 'std']).reset_index()
+    ax1.plot(monday_daily['DayOfMonth'], monday_daily['mean'], 'b-', label='Average', linewidth=2)
+    ax1.fill_between(monday_daily['DayOfMonth'],
+                    monday_daily['mean'] - monday_daily['std'],
+                    monday_daily['mean'] + monday_daily['std'],
+                    alpha=0.2, color='blue')
+    ax1.set_title(f'Monday Water Levels - {month}')
+    ax1.set_xlabel('Day of Month')
+    ax1.set_ylabel('Water Level (m)')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    # Saturday means
+    saturday_daily = saturday_data.groupby(saturday_data['DateTime'].dt.day.rename('DayOfMonth'), observed=True)[level_column].agg(['mean', 'std']).reset_index()
+    ax2.plot(saturday_daily['DayOfMonth'], saturday_daily['mean'], 'r-', label='Average', linewidth=2)
+    ax2.fill_between(saturday_daily['DayOfMonth'],
+                    saturday_daily['mean'] - saturday_daily['std'],
+                    saturday_daily['mean'] + saturday_daily['std'],
+                    alpha=0.2, color='red')
+    ax2.set_title(f'Saturday Water Levels - {month}')
+    ax2.set_xlabel('Day of Month')
+    ax2.set_ylabel('Water Level (m)')
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+    # Set same y-axis for both
+    ax1.set_ylim(y_min, y_max)
+    ax2.set_ylim(y_min, y_max)
+    # Fixed margins instead of re-solving the layout for every month
+    fig.subplots_adjust(left=0.06, right=0.98, top=0.92, bottom=0.12, wspace=0.2)
+    path = os.path.join(save_dir, f'monthly_line_graphs_{month}.png')
+    fig.savefig(path, dpi=300)
+    chart_paths.append(path)
+    # 6. Actual values for Mondays (time series)
+    if not monday_data.empty:
+        ax = _new_chart(fig, 18, 6)
+        ax.plot(monday_data['DateTime'], monday_data[level_column], color='blue', marker='.', linestyle='-', linewidth=1, markersize=2, rasterized=True)
+        ax.set_title(f'All Monday Water Level Values - {month}')
+        ax.set_xlabel('DateTime')
+        ax.set_ylabel('Water Level (m)')
+        ax.grid(True, alpha=0.3)
+        # Set same y-axis as Saturday for this month
+        if not saturday_data.empty:
+            ax.set_ylim(y_min, y_max)
+        path = os.path.join(save_dir, f'monday_actual_values_{month}.png')
+        fig.savefig(path, dpi=150)
+        chart_paths.append(path)
+    # 7. Actual values for Saturdays (time series)
+    if not saturday_data.empty:
+        ax = _new_chart(fig, 18, 6)
+        ax.plot(saturday_data['DateTime'], saturday_data[level_column], color='red', marker='.', linestyle='-', linewidth=1, markersize=2, rasterized=True)
+        ax.set_title(f'All Saturday Water Level Values - {month}')
+        ax.set_xlabel('DateTime')
+        ax.set_ylabel('Water Level (m)')
+        ax.grid(True, alpha=0.3)
+        # Set same y-axis as Monday for this month
+        if not monday_data.empty:
+            ax.set_ylim(y_min, y_max)
+        path = os.path.join(save_dir, f'saturday_actual_values_{month}.png')
+        fig.savefig(path, dpi=150)
+        chart_paths.append(path)
+    plt.close(fig)
+    return chart_paths
+
+def create_visualizations(df, level_column, hourly_stats, save_dir):
+    """
+    Create detailed visualizations comparing Mondays and Saturdays.
+    The summary charts are drawn on one reused figure and saved at 300 dpi; the
+    per-month charts are rendered in parallel by _plot_month, one month per process.
+    """
+    chart_paths = []
+    fig = plt.figure()
     
     # 1. Overall distribution comparison
-    plt.figure(figsize=(12, 6))
-    sns.boxplot(x='DayName', y=level_column, data=df)
-    plt.title('Overall Water Level Distribution: Monday vs Saturday')
-    plt.ylabel('Water Level (m)')
+    ax = _new_chart(fig, 12, 6)
+    sns.boxplot(x='DayName', y=level_column, data=df, ax=ax)
+    ax.set_title('Overall Water Level Distribution: Monday vs Saturday')
+    ax.set_ylabel('Water Level (m)')
     path = os.path.join(save_dir, 'overall_distribution.png')
-    plt.savefig(path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(path, dpi=300)
     chart_paths.append(path)
     
     # 2. Daytime distribution comparison
-    plt.figure(figsize=(12, 6))
+    ax = _new_chart(fig, 12, 6)
     daytime_data = df[df['IsDaytime']]
-    sns.boxplot(x='DayName', y=level_column, data=daytime_data)
-    plt.title('Daytime (08:00-15:00) Water Level Distribution')
-    plt.ylabel('Water Level (m)')
+    sns.boxplot(x='DayName', y=level_column, data=daytime_data, ax=ax)
+    ax.set_title('Daytime (08:00-15:00) Water Level Distribution')
+    ax.set_ylabel('Water Level (m)')
     path = os.path.join(save_dir, 'daytime_distribution.png')
-    plt.savefig(path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(path, dpi=300)
     chart_paths.append(path)
     
     # 3. Monthly trends
-    plt.figure(figsize=(15, 7))
-    monthly_means = df.groupby(['Month', 'DayName'])[level_column].mean().unstack()
-    monthly_means.plot(marker='o')
-    plt.title('Monthly Average Water Levels')
-    plt.xlabel('Month')
-    plt.ylabel('Average Water Level (m)')
-    plt.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
+    ax = _new_chart(fig, 15, 7)
+    monthly_means = df.groupby(['Month', 'DayName'], observed=True)[level_column].mean().unstack()
+    monthly_means.plot(marker='o', ax=ax)
+    ax.set_title('Monthly Average Water Levels')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Average Water Level (m)')
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', rotation=45)
     path = os.path.join(save_dir, 'monthly_trends.png')
-    plt.savefig(path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(path, dpi=300)
     chart_paths.append(path)
     
     # 4. Hourly patterns with daytime highlight
-    plt.figure(figsize=(15, 7))
+    ax = _new_chart(fig, 15, 7)
+    # Hourly mean/std come from analyze_data instead of being regrouped here
     for day in ['Monday', 'Saturday']:
-        day_data = df[df['DayName'] == day]
-        hourly_mean = day_data.groupby('Hour')[level_column].mean()
-        hourly_std = day_data.groupby('Hour')[level_column].std()
-        plt.plot(hourly_mean.index, hourly_mean.values, label=day, marker='o')
-        plt.fill_between(hourly_mean.index, 
-                        hourly_mean.values - hourly_std.values,
-                        hourly_mean.values + hourly_std.values,
+        day_hourly = hourly_stats.xs(day, level='DayName')
+        ax.plot(day_hourly.index, day_hourly['mean'].values, label=day, marker='o')
+        ax.fill_between(day_hourly.index, 
+                        day_hourly['mean'].values - day_hourly['std'].values,
+                        day_hourly['mean'].values + day_hourly['std'].values,
                         alpha=0.2)
     
     # Add daytime highlight
-    plt.axvspan(8, 15, color='yellow', alpha=0.2, label='Daytime (08:00-15:00)')
-    plt.title('Average Water Level by Hour')
-    plt.xlabel('Hour of Day')
-    plt.ylabel('Water Level (m)')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
+    ax.axvspan(8, 15, color='yellow', alpha=0.2, label='Daytime (08:00-15:00)')
+    ax.set_title('Average Water Level by Hour')
+    ax.set_xlabel('Hour of Day')
+    ax.set_ylabel('Water Level (m)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
     path = os.path.join(save_dir, 'hourly_patterns.png')
-    plt.savefig(path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(path, dpi=300)
     chart_paths.append(path)
     
-    # 5. Monthly line graphs for each month (means)
+    plt.close(fig)
+    
+    # 5.-7. Per-month charts, one month per worker process
     months = sorted(df['Month'].unique())
-    for month in months:
-        month_data = df[df['Month'] == month].copy()
-        month_data['DayOfMonth'] = month_data['DateTime'].dt.day
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 7))
-        # Monday means
-        monday_data = month_data[month_data['DayName'] == 'Monday']
-        monday_daily = monday_data.groupby('DayOfMonth')[level_column].agg(['mean', 'std']).reset_index()
-        ax1.plot(monday_daily['DayOfMonth'], monday_daily['mean'], 'b-', label='Average', linewidth=2)
-        ax1.fill_between(monday_daily['DayOfMonth'],
-                        monday_daily['mean'] - monday_daily['std'],
-                        monday_daily['mean'] + monday_daily['std'],
-                        alpha=0.2, color='blue')
-        ax1.set_title(f'Monday Water Levels - {month}')
-        ax1.set_xlabel('Day of Month')
-        ax1.set_ylabel('Water Level (m)')
-        ax1.grid(True, alpha=0.3)
-        ax1.legend()
-        # Saturday means
-        saturday_data = month_data[month_data['DayName'] == 'Saturday']
-        saturday_daily = saturday_data.groupby('DayOfMonth')[level_column].agg(['mean', 'std']).reset_index()
-        ax2.plot(saturday_daily['DayOfMonth'], saturday_daily['mean'], 'r-', label='Average', linewidth=2)
-        ax2.fill_between(saturday_daily['DayOfMonth'],
-                        saturday_daily['mean'] - saturday_daily['std'],
-                        saturday_daily['mean'] + saturday_daily['std'],
-                        alpha=0.2, color='red')
-        ax2.set_title(f'Saturday Water Levels - {month}')
-        ax2.set_xlabel('Day of Month')
-        ax2.set_ylabel('Water Level (m)')
-        ax2.grid(True, alpha=0.3)
-        ax2.legend()
-        # Set same y-axis for both
-        all_vals = pd.concat([monday_data[level_column], saturday_data[level_column]])
-        if not all_vals.empty:
-            y_min = all_vals.min()
-            y_max = all_vals.max()
-            ax1.set_ylim(y_min, y_max)
-            ax2.set_ylim(y_min, y_max)
-        plt.tight_layout()
-        path = os.path.join(save_dir, f'monthly_line_graphs_{month}.png')
-        plt.savefig(path, dpi=300, bbox_inches='tight')
-        plt.close()
-        chart_paths.append(path)
-        # 6. Actual values for Mondays (time series)
-        if not monday_data.empty:
-            plt.figure(figsize=(18, 6))
-            plt.plot(monday_data['DateTime'], monday_data[level_column], color='blue', marker='.', linestyle='-', linewidth=1, markersize=2)
-            plt.title(f'All Monday Water Level Values - {month}')
-            plt.xlabel('DateTime')
-            plt.ylabel('Water Level (m)')
-            plt.grid(True, alpha=0.3)
-            # Set same y-axis as Saturday for this month
-            if not saturday_data.empty:
-                y_min = min(monday_data[level_column].min(), saturday_data[level_column].min())
-                y_max = max(monday_data[level_column].max(), saturday_data[level_column].max())
-                plt.ylim(y_min, y_max)
-            path = os.path.join(save_dir, f'monday_actual_values_{month}.png')
-            plt.savefig(path, dpi=300, bbox_inches='tight')
-            plt.close()
-            chart_paths.append(path)
-        # 7. Actual values for Saturdays (time series)
-        if not saturday_data.empty:
-            plt.figure(figsize=(18, 6))
-            plt.plot(saturday_data['DateTime'], saturday_data[level_column], color='red', marker='.', linestyle='-', linewidth=1, markersize=2)
-            plt.title(f'All Saturday Water Level Values - {month}')
-            plt.xlabel('DateTime')
-            plt.ylabel('Water Level (m)')
-            plt.grid(True, alpha=0.3)
-            # Set same y-axis as Monday for this month
-            if not monday_data.empty:
-                y_min = min(monday_data[level_column].min(), saturday_data[level_column].min())
-                y_max = max(monday_data[level_column].max(), saturday_data[level_column].max())
-                plt.ylim(y_min, y_max)
-            path = os.path.join(save_dir, f'saturday_actual_values_{month}.png')
-            plt.savefig(path, dpi=300, bbox_inches='tight')
-            plt.close()
-            chart_paths.append(path)
+    # Split into (month, day) subsets once, keeping only the columns the charts use
+    cols = ['DateTime', level_column]
+    day_groups = {key: group[cols] for key, group in df.groupby(['Month', 'DayName'], observed=True)}
+    empty = df[cols].iloc[0:0]
+    mondays = [day_groups.get((month, 'Monday'), empty) for month in months]
+    saturdays = [day_groups.get((month, 'Saturday'), empty) for month in months]
+    with ProcessPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, len(months)))) as executor:
+        for month_paths in executor.map(_plot_month, months, mondays, saturdays,
+                                        repeat(level_column), repeat(save_dir)):
+            chart_paths.extend(month_paths)
     return chart_paths
 
+def _png_display_size(path):
+    """Size in pixels at which Excel shows a PNG: its pixel size scaled from its DPI to 96."""
+    with Image.open(path) as img:
+        (width, height), (x_dpi, y_dpi) = img.size, img.info.get('dpi', (96, 96))
+    return width * 96 / x_dpi, height * 96 / y_dpi
+
 def export_to_excel(df, stats, daytime_stats, monthly_stats, hourly_stats, level_column, chart_paths, save_dir):
     """
-    Export analysis results to Excel
+    Export analysis results to Excel.
+    Tables and chart images are written by xlsxwriter in a single pass.
     """
     excel_file = os.path.join(save_dir, 'monday_vs_saturday_analysis.xlsx')
     
-    with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+    months = sorted(df['Month'].unique())
+    chart_titles = ['Overall Distribution', 'Daytime Distribution', 'Monthly Trends', 'Hourly Patterns']
+    chart_titles += [f'Monthly Line Graphs - {month}' for month in months]
+    chart_titles += [f'Monday Actual Values - {month}' for month in months]
+    chart_titles += [f'Saturday Actual Values - {month}' for month in months]
+    
+    with pd.ExcelWriter(excel_file, engine='xlsxwriter') as writer:
         # Export statistics
         stats.to_excel(writer, sheet_name='Overall Statistics')
         daytime_stats.to_excel(writer, sheet_name='Daytime Statistics')
-        monthly_stats.to_excel(writer, sheet_name='Monthly Statistics')
+        monthly_stats.rename(index=str, level='Month').to_excel(writer, sheet_name='Monthly Statistics')
         hourly_stats.to_excel(writer, sheet_name='Hourly Statistics')
         
         # Export sample of raw data
-        df_sample = df.sample(n=min(1000, len(df)))
-        df_sample = df_sample.sort_values('DateTime')
+        # Every step-th row (df is chronological), about 1000 rows, no random sample + sort
+        step = max(1, len(df) // 1000)
         cols_to_export = ['DateTime', 'DayName', 'IsDaytime', level_column]
-        df_sample[cols_to_export].to_excel(writer, sheet_name='Sample Data', index=False)
-    
-    # Add charts
-    from openpyxl import load_workbook
-    from openpyxl.drawing.image import Image
-    
-    workbook = load_workbook(excel_file)
-    chart_sheet = workbook.create_sheet('Charts')
-    
-    months = sorted(df['Month'].unique())
-    chart_titles = ['Overall Distribution', 'Daytime Distribution', 'Monthly Trends', 'Hourly Patterns']
-    chart_titles += [f'Monthly Line Graphs - {month}' for month in months]
-    chart_titles += [f'Monday Actual Values - {month}' for month in months]
-    chart_titles += [f'Saturday Actual Values - {month}' for month in months]
-    current_row = 1
-    for i, (chart_path, title) in enumerate(zip(chart_paths, chart_titles)):
-        img = Image(chart_path)
-        img.width = 800
-        img.height = 400
-        chart_sheet.add_image(img, f'A{current_row}')
-        current_row += 25
-    
-    workbook.save(excel_file)
+        df_sample = df.iloc[::step][cols_to_export]
+        # Back to float64 with float32 noise rounded off so the sheet shows the measured values
+        df_sample = df_sample.astype({level_column: 'float64'}).round({level_column: 6})
+        df_sample.to_excel(writer, sheet_name='Sample Data', index=False)
+        
+        # Add charts, each shown at 800x400 pixels; the images are read when the workbook is closed
+        chart_sheet = writer.book.add_worksheet('Charts')
+        current_row = 0
+        for chart_path, title in zip(chart_paths, chart_titles):
+            img_width, img_height = _png_display_size(chart_path)
+            chart_sheet.insert_image(current_row, 0, chart_path,
+                                     {'x_scale': 800 / img_width, 'y_scale': 400 / img_height})
+            current_row += 25
     
     # Clean up temporary chart files
     for chart_path in chart_paths:
@@ -312,7 +368,7 @@ def main():
         
         # Create visualizations
         print("Creating visualizations...")
-        chart_paths = create_visualizations(df, level_column, save_dir)
+        chart_paths = create_visualizations(df, level_column, hourly_stats, save_dir)
         
         # Export to Excel
         print("Exporting to Excel...")
@@ -58,7 +58,8 @@ def setup_station_directories():
         if os.path.exists(data_dir):
             # Count CSV files
             try:
-                csv_files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+                with os.scandir(data_dir) as entries:
+                    csv_files = [e.name for e in entries if e.is_file() and e.name.endswith('.csv')]
                 print(f"  Status: READY ({len(csv_files)} CSV files found)")
                 if csv_files:
                     print(f"  Files: {', '.join(csv_files[:3])}{'...' if len(csv_files) > 3 else ''}")
@@ -81,7 +82,8 @@ def setup_station_directories():
     print(f"\nRain data directory: {rain_data_dir}")
     if os.path.exists(rain_data_dir):
         try:
-            rain_files = [f for f in os.listdir(rain_data_dir) if f.endswith('.csv')]
+            with os.scandir(rain_data_dir) as entries:
+                rain_files = [e.name for e in entries if e.is_file() and e.name.endswith('.csv')]
             print(f"Status: READY ({len(rain_files)} CSV files found)")
             if rain_files:
                 print(f"Files: {', '.join(rain_files)}")
@@ -1,21 +1,68 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to files
 import matplotlib.pyplot as plt
+from PIL import Image
 from datetime import datetime
 import os
-import gc
-from openpyxl import load_workbook
-from openpyxl.drawing.image import Image
+import io
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, runs_above then runs as plain Python
+    njit = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Station CSVs are read with PyArrow's multithreaded parser; Date and Time stay text
+# so they can be combined into DateTime
+STATION_CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types={'Date': pa.string(), 'Time': pa.string()})
+
+def runs_above(high_mask: np.ndarray, gap_before: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find runs of consecutive readings above the threshold.
+    gap_before[i] marks a gap in the record just before row i, which ends any run.
+    Returns the start and end (inclusive) row positions of each run.
+    """
+    n = high_mask.shape[0]
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    count = 0
+    in_run = False
+    for i in range(n):
+        if high_mask[i]:
+            if in_run and gap_before[i]:
+                ends[count] = i - 1
+                count += 1
+                in_run = False
+            if not in_run:
+                starts[count] = i
+                in_run = True
+        elif in_run:
+            ends[count] = i - 1
+            count += 1
+            in_run = False
+    if in_run:
+        ends[count] = n - 1
+        count += 1
+    return starts[:count], ends[:count]
+
+if njit is not None:
+    runs_above = njit(cache=True)(runs_above)
+
 class WaterStationAnalyzer:
     """
     Professional water station analyzer that can handle multiple stations
@@ -33,6 +80,7 @@ class WaterStationAnalyzer:
         self.stations = self.config.get('stations', {})
         self.base_output_dir = self.config.get('base_output_dir', '')
         self.rain_data_dir = self.config.get('rain_data_dir', '')
+        self.chart_dpi = self.config.get('analysis_settings', {}).get('chart_dpi', 150)
         
     def _load_config(self, config_file: str) -> Dict:
         """Load station configuration from JSON file."""
@@ -100,16 +148,16 @@ class WaterStationAnalyzer:
             }
         }
     
-    def process_station_csv(self, station_id: str, station_config: Dict) -> List[Dict]:
+    def process_station_csv(self, station_id: str, station_config: Dict) -> Iterator[Dict]:
         """
-        Process CSV files for a specific station.
+        Process CSV files for a specific station, one month at a time.
         
         Args:
             station_id: Unique identifier for the station
             station_config: Configuration dictionary for the station
             
-        Returns:
-            List of processed monthly data dictionaries
+        Yields:
+            Processed monthly data dictionaries
         """
         directory_path = station_config['data_dir']
         threshold = station_config['threshold']
@@ -118,27 +166,25 @@ class WaterStationAnalyzer:
         
         # Get all CSV files in the directory
         try:
-            csv_files = [f for f in os.listdir(directory_path) if f.endswith('.csv')]
-            csv_files.sort()
+            with os.scandir(directory_path) as entries:
+                csv_files = sorted(e.name for e in entries if e.is_file() and e.name.endswith('.csv'))
         except FileNotFoundError:
             logger.error(f"Directory not found: {directory_path}")
-            return []
+            return
         
         logger.info(f"Found {len(csv_files)} CSV files for {station_config['name']}")
         
-        monthly_data = []
-        
         for csv_file in csv_files:
             file_path = os.path.join(directory_path, csv_file)
             logger.info(f"Processing {csv_file}...")
             
             try:
-                df = pd.read_csv(file_path)
+                df = self._read_station_csv(file_path)
                 logger.info(f"  - Rows: {len(df)}")
                 
-                # Convert Time column to string and combine Date and Time columns
-                df['Time'] = df['Time'].astype(str)
-                df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'])
+                # Combine Date and Time: parse the dates with a fixed format and add the
+                # times as offsets, instead of inferring the format of a concatenated string
+                df['DateTime'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', cache=True) + pd.to_timedelta(df['Time'])
                 
                 # Find the level column
                 level_column = self._find_level_column(df, csv_file)
@@ -151,28 +197,39 @@ class WaterStationAnalyzer:
                 # Get month name from filename
                 month_name = csv_file.replace('.csv', '')
                 
-                # Store processed data
-                monthly_data.append({
+                # Readings above the threshold, computed once for charts, statistics and export
+                high_mask = df[level_column].to_numpy() > threshold
+                
+                # Hand over the processed month
+                month_info = {
                     'station_id': station_id,
                     'station_name': station_config['name'],
                     'month_name': month_name,
                     'dataframe': df,
                     'level_column': level_column,
-                    'threshold': threshold
-                })
+                    'threshold': threshold,
+                    'high_mask': high_mask
+                }
                 
             except Exception as e:
                 logger.error(f"Error processing {csv_file}: {str(e)}")
                 continue
-        
-        return monthly_data
+            
+            yield month_info
+            # Release the month before the next file is read
+            del df, month_info
+    
+    def _read_station_csv(self, file_path: str) -> pd.DataFrame:
+        """Read one station CSV with PyArrow and convert it to pandas once."""
+        table = pacsv.read_csv(file_path, convert_options=STATION_CSV_CONVERT_OPTIONS)
+        return table.to_pandas()
     
     def _find_level_column(self, df: pd.DataFrame, filename: str) -> Optional[str]:
         """Find the water level column in the dataframe."""
         # First try to find column with 'level' in name
-        for col in df.columns:
-            if 'level' in col.lower():
-                return col
+        is_level = df.columns.str.contains('level', case=False, regex=False)
+        if is_level.any():
+            return df.columns[is_level][0]
         
         # If not found, use the last numeric column
         numeric_columns = df.select_dtypes(include=['float64', 'int64']).columns
@@ -187,16 +244,12 @@ class WaterStationAnalyzer:
     def _clean_water_data(self, df: pd.DataFrame, level_column: str) -> pd.DataFrame:
         """Clean water level data by removing invalid values."""
         # Convert to numeric, replacing non-numeric values with NaN
-        df[level_column] = pd.to_numeric(df[level_column], errors='coerce')
-        
-        # Remove NaN values
-        df = df.dropna(subset=[level_column])
-        
-        # Remove negative values and unreasonably large values
-        df = df[df[level_column] >= 0]
-        df = df[df[level_column] < 10]
+        values = pd.to_numeric(df[level_column], errors='coerce').to_numpy(dtype=float)
         
-        return df
+        # Remove NaN, negative and unreasonably large values with one mask (a single copy)
+        mask = np.isfinite(values) & (values >= 0) & (values < 10)
+        # float32 keeps ~7 significant digits, plenty for levels in metres, at half the memory
+        return df.loc[mask].assign(**{level_column: values[mask].astype(np.float32)})
     
     def process_rain_data(self) -> Dict:
         """Process rain measurement data for all stations."""
@@ -207,8 +260,15 @@ class WaterStationAnalyzer:
         for station in ['Afek', 'Haifa']:
             csv_file = f"{station}.csv"
             file_path = os.path.join(self.rain_data_dir, csv_file)
+            # Parsed copy of the CSV, reused while it is at least as new as the CSV
+            cache_path = os.path.join(self.rain_data_dir, f"{station}.parquet")
             
             try:
+                if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+                    rain_data[station] = pd.read_parquet(cache_path)
+                    logger.info(f"Loaded {csv_file} from cache: {len(rain_data[station])} rows")
+                    continue
+                
                 df = pd.read_csv(file_path)
                 logger.info(f"Processed {csv_file}: {len(df)} rows")
                 
@@ -220,16 +280,27 @@ class WaterStationAnalyzer:
                     columns_to_drop.append('Code')
                 
                 df = df.drop(columns=columns_to_drop)
-                rain_data[station] = df
+                
+                # Parse dates once and index by them, so charts can slice each month directly
+                df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y')
+                rain_data[station] = df.set_index('Date').sort_index()
                 
             except Exception as e:
                 logger.error(f"Error processing {csv_file}: {str(e)}")
                 continue
+            
+            # The parsed data is used either way; a failed write only means it is parsed again next run
+            try:
+                rain_data[station].to_parquet(cache_path, compression='zstd')
+            except Exception as e:
+                logger.warning(f"Could not write rain data cache {cache_path}: {str(e)}")
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
         
         return rain_data
     
-    def create_water_level_chart(self, monthly_info: Dict, rain_data: Dict) -> Tuple[str, str]:
-        """Create water level charts for a specific month and station."""
+    def create_water_level_chart(self, monthly_info: Dict, rain_data: Dict) -> Tuple[io.BytesIO, io.BytesIO]:
+        """Create water level charts for a specific month and station as in-memory PNGs."""
         df = monthly_info['dataframe']
         level_column = monthly_info['level_column']
         month_name = monthly_info['month_name']
@@ -237,50 +308,49 @@ class WaterStationAnalyzer:
         threshold = monthly_info['threshold']
         
         # Create high level DataFrame
-        high_level_df = df[df[level_column] > threshold]
-        
-        # Create output directory for this station
-        station_output_dir = os.path.join(self.base_output_dir, station_name.replace(' ', '_'))
-        os.makedirs(station_output_dir, exist_ok=True)
+        high_level_df = df.loc[monthly_info['high_mask']]
         
         # Create both dots and bars charts
-        chart_paths = self._create_chart_versions(
+        chart_images = self._create_chart_versions(
             df, high_level_df, level_column, month_name, station_name, 
-            threshold, station_output_dir, rain_data
+            threshold, rain_data
         )
         
-        return chart_paths
+        return chart_images
     
     def _create_chart_versions(self, df: pd.DataFrame, high_level_df: pd.DataFrame, 
                               level_column: str, month_name: str, station_name: str,
-                              threshold: float, output_dir: str, rain_data: Dict) -> Tuple[str, str]:
-        """Create both dots and bars versions of the water level chart."""
+                              threshold: float, rain_data: Dict) -> Tuple[io.BytesIO, io.BytesIO]:
+        """
+        Create both dots and bars versions of the water level chart on one figure.
+        Saved as PNGs in memory at chart_dpi (150 by default, plenty for the 800x400 images embedded in Excel).
+        """
+        fig, ax = plt.subplots(figsize=(15, 8))
         
         # Version 1: Dots
-        fig1, ax1 = plt.subplots(figsize=(15, 8))
-        self._plot_water_levels(ax1, df, high_level_df, level_column, threshold, rain_data, 'scatter')
-        plt.title(f'{station_name} - Water Level and Rainfall Measurements - {month_name} (Dots)')
-        plt.tight_layout()
-        
-        dots_path = os.path.join(output_dir, f'water_level_chart_{month_name}_dots.png')
-        plt.savefig(dots_path, dpi=300, bbox_inches='tight')
-        plt.close(fig1)
-        
-        # Version 2: Bars
-        fig2, ax2 = plt.subplots(figsize=(15, 8))
-        self._plot_water_levels(ax2, df, high_level_df, level_column, threshold, rain_data, 'bar')
-        plt.title(f'{station_name} - Water Level and Rainfall Measurements - {month_name} (Bars)')
-        plt.tight_layout()
-        
-        bars_path = os.path.join(output_dir, f'water_level_chart_{month_name}_bars.png')
-        plt.savefig(bars_path, dpi=300, bbox_inches='tight')
-        plt.close(fig2)
-        
-        return dots_path, bars_path
+        rain_ax = self._plot_water_levels(ax, df, high_level_df, level_column, threshold, rain_data, 'scatter')
+        ax.set_title(f'{station_name} - Water Level and Rainfall Measurements - {month_name} (Dots)')
+        fig.tight_layout()
+        
+        dots_png = io.BytesIO()
+        fig.savefig(dots_png, format='png', dpi=self.chart_dpi, bbox_inches='tight')
+        
+        # Version 2: Bars, redrawn on the same figure
+        rain_ax.remove()
+        ax.clear()
+        self._plot_water_levels(ax, df, high_level_df, level_column, threshold, rain_data, 'bar')
+        ax.set_title(f'{station_name} - Water Level and Rainfall Measurements - {month_name} (Bars)')
+        fig.tight_layout()
+        
+        bars_png = io.BytesIO()
+        fig.savefig(bars_png, format='png', dpi=self.chart_dpi, bbox_inches='tight')
+        plt.close(fig)
+        
+        return dots_png, bars_png
     
     def _plot_water_levels(self, ax, df: pd.DataFrame, high_level_df: pd.DataFrame,
                           level_column: str, threshold: float, rain_data: Dict, plot_type: str):
-        """Plot water levels and rain data on the given axis."""
+        """Plot water levels and rain data on the given axis; returns the secondary rain axis."""
         
         # Plot water levels on primary y-axis
         ax.plot(df['DateTime'], df[level_column], color='blue', alpha=0.5, label='Water Level')
@@ -311,184 +381,239 @@ class WaterStationAnalyzer:
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
         
         # Rotate x-axis labels
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        return ax2
     
     def _plot_rain_data(self, ax, df: pd.DataFrame, rain_data: Dict, plot_type: str):
         """Plot rain data on the secondary axis."""
         for station, rain_df in rain_data.items():
             if len(rain_df) > 0:
-                rain_df_copy = rain_df.copy()
-                rain_df_copy['Date'] = pd.to_datetime(rain_df_copy['Date'], format='%d/%m/%Y')
-                
-                # Filter rain data to match the month period
-                start_date = df['DateTime'].min().date()
-                end_date = df['DateTime'].max().date()
+                # Slice rain data to the days of the month period (sorted DatetimeIndex)
+                start_date = df['DateTime'].min().normalize()
+                end_date = df['DateTime'].max().normalize()
                 
-                month_rain = rain_df_copy[
-                    (rain_df_copy['Date'].dt.date >= start_date) & 
-                    (rain_df_copy['Date'].dt.date <= end_date)
-                ]
+                month_rain = rain_df.loc[start_date:end_date]
                 
                 if len(month_rain) > 0:
                     color = 'green' if station == 'Afek' else 'orange'
                     
                     if plot_type == 'scatter':
-                        ax.scatter(month_rain['Date'], month_rain['Rain'], 
+                        ax.scatter(month_rain.index, month_rain['Rain'], 
                                  color=color, s=100, edgecolor='black', linewidth=1,
                                  label=f'{station} Rain (mm)')
                     else:  # bar
                         bar_width = 0.35
-                        if station == 'Afek':
-                            ax.bar([d - pd.Timedelta(hours=6) for d in month_rain['Date']], 
-                                  month_rain['Rain'], color=color, alpha=0.7, width=bar_width,
-                                  label=f'{station} Rain (mm)')
-                        else:
-                            ax.bar([d + pd.Timedelta(hours=6) for d in month_rain['Date']], 
-                                  month_rain['Rain'], color=color, alpha=0.7, width=bar_width,
-                                  label=f'{station} Rain (mm)')
+                        # Shift Afek bars 6 hours left and the other station 6 hours right
+                        offset = np.timedelta64(-6 if station == 'Afek' else 6, 'h')
+                        ax.bar(month_rain.index.to_numpy() + offset, 
+                              month_rain['Rain'], color=color, alpha=0.7, width=bar_width,
+                              label=f'{station} Rain (mm)')
         
         ax.set_ylabel('Rainfall (mm)', color='green')
         ax.tick_params(axis='y', labelcolor='green')
     
-    def export_station_to_excel(self, station_monthly_data: List[Dict], chart_paths: List[Tuple[str, str]]) -> str:
-        """Export all data for a station to Excel."""
-        if not station_monthly_data:
+    def _monthly_statistics(self, month_info: Dict) -> Dict:
+        """Summary statistics for one month of station data."""
+        threshold = month_info['threshold']
+        # All statistics come from the level values as one NumPy array
+        levels = month_info['dataframe'][month_info['level_column']].to_numpy()
+        
+        # Readings are taken every 5 minutes
+        num_high_readings = int(month_info['high_mask'].sum())
+        total_minutes = num_high_readings * 5
+        hours = total_minutes // 60
+        remaining_minutes = total_minutes % 60
+        
+        # High water events: runs of consecutive readings above the threshold,
+        # each lasting from its first to its last reading plus one 5-minute interval.
+        # Missing or cleaned-out readings (a step over 5 minutes) split a run
+        times = month_info['dataframe']['DateTime'].to_numpy()
+        gap_before = np.concatenate(([False], np.diff(times) > np.timedelta64(5, 'm')))
+        starts, ends = runs_above(month_info['high_mask'], gap_before)
+        event_minutes = (times[ends] - times[starts]) / np.timedelta64(1, 'm') + 5
+        
+        return {
+            'Month': month_info['month_name'],
+            'Total Readings': levels.size,
+            f'High Water Level Readings (>{threshold}m)': num_high_readings,
+            f'Total Hours Above {threshold}m': hours,
+            f'Additional Minutes Above {threshold}m': remaining_minutes,
+            f'High Water Level Events (>{threshold}m)': len(starts),
+            'Longest Event (minutes)': event_minutes.max() if len(starts) else 0,
+            # Rounded like the exported levels, which drops the float32 noise digits
+            'Maximum Water Level': round(float(levels.max()), 6) if levels.size else np.nan,
+            'Average Water Level': round(float(levels.mean()), 6) if levels.size else np.nan,
+        }
+    
+    def export_station_to_excel(self, monthly_results: Iterable[Tuple[Dict, Tuple[io.BytesIO, io.BytesIO]]]) -> str:
+        """
+        Export all data for a station to Excel.
+        
+        monthly_results yields (month_info, chart_images) one month at a time; each month's
+        sheets are written as it arrives, so only one month of data is held in memory.
+        """
+        monthly_results = iter(monthly_results)
+        first = next(monthly_results, None)
+        if first is None:
             return ""
         
-        station_name = station_monthly_data[0]['station_name']
+        station_name = first[0]['station_name']
         station_output_dir = os.path.join(self.base_output_dir, station_name.replace(' ', '_'))
         excel_file = os.path.join(station_output_dir, f'{station_name}_Analysis.xlsx')
+        os.makedirs(station_output_dir, exist_ok=True)
         
         logger.info(f"Creating Excel file: {excel_file}")
         
-        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-            for i, month_info in enumerate(station_monthly_data):
-                df = month_info['dataframe']
+        # constant_memory makes xlsxwriter flush each row to disk as soon as the next row starts
+        excel_options = {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'}
+        with pd.ExcelWriter(excel_file, engine='xlsxwriter', engine_kwargs={'options': excel_options}) as writer:
+            header_format = writer.book.add_format({'bold': True})
+            for month_info, chart_images in itertools.chain([first], monthly_results):
                 level_column = month_info['level_column']
                 month_name = month_info['month_name']
-                threshold = month_info['threshold']
+                # Back to float64 with float32 noise rounded off so the sheets show the measured values
+                df = month_info['dataframe'].astype({level_column: 'float64'}).round({level_column: 6})
                 
                 # Create high level DataFrame
-                high_level_df = df[df[level_column] > threshold]
+                high_level_df = df.loc[month_info['high_mask']]
                 
-                # Calculate statistics
-                num_high_readings = len(high_level_df)
-                total_minutes = num_high_readings * 5
-                hours = total_minutes // 60
-                remaining_minutes = total_minutes % 60
-                
-                stats_dict = {
-                    'Month': month_name,
-                    'Total Readings': len(df),
-                    f'High Water Level Readings (>{threshold}m)': num_high_readings,
-                    f'Total Hours Above {threshold}m': hours,
-                    f'Additional Minutes Above {threshold}m': remaining_minutes,
-                    'Maximum Water Level': df[level_column].max(),
-                    'Average Water Level': df[level_column].mean(),
-                }
+                # Statistics were calculated when the month was charted
+                stats_dict = month_info['statistics']
                 
                 # Export data to sheets
-                df.to_excel(writer, sheet_name=f"{month_name}_All_Measurements", index=False)
-                high_level_df.to_excel(writer, sheet_name=f"{month_name}_High_Levels", index=False)
+                self._write_sheet(writer.book, f"{month_name}_All_Measurements", df, header_format)
+                self._write_sheet(writer.book, f"{month_name}_High_Levels", high_level_df, header_format)
                 stats_df = pd.DataFrame([stats_dict])
-                stats_df.to_excel(writer, sheet_name=f"{month_name}_Statistics", index=False)
+                self._write_sheet(writer.book, f"{month_name}_Statistics", stats_df, header_format)
+                
+                # Add charts
+                self._add_charts_to_excel(writer.book, chart_images, month_name)
                 
-                # Add charts if available
-                if i < len(chart_paths):
-                    self._add_charts_to_excel(writer, chart_paths[i], month_name)
+                # Drop this month's data before the next one is read
+                del df, month_info
         
         return excel_file
     
-    def _add_charts_to_excel(self, writer, chart_paths: Tuple[str, str], month_name: str):
-        """Add charts to Excel sheet."""
-        workbook = writer.book
-        chart_sheet = workbook.create_sheet(f"{month_name}_Charts")
-        
-        # Add dots chart
-        if os.path.exists(chart_paths[0]):
-            img_dots = Image(chart_paths[0])
-            img_dots.width = 800
-            img_dots.height = 400
-            chart_sheet.add_image(img_dots, 'A1')
-        
-        # Add bars chart
-        if os.path.exists(chart_paths[1]):
-            img_bars = Image(chart_paths[1])
-            img_bars.width = 800
-            img_bars.height = 400
-            chart_sheet.add_image(img_bars, 'A25')
+    def _write_sheet(self, workbook, sheet_name: str, df: pd.DataFrame, header_format):
+        """
+        Write a DataFrame to a new sheet row by row. constant_memory mode only keeps
+        the current row, so rows must be written in order (pandas' to_excel writes by column).
+        """
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, list(df.columns), header_format)
+        for row_number, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            # Missing values are left as empty cells, as to_excel does
+            worksheet.write_row(row_number, 0, [None if value != value else value for value in row])
+    
+    @staticmethod
+    def _png_display_size(png: io.BytesIO) -> Tuple[float, float]:
+        """Size in pixels at which Excel shows a PNG: its pixel size scaled from its DPI to 96."""
+        with Image.open(png) as img:
+            (width, height), (x_dpi, y_dpi) = img.size, img.info.get('dpi', (96, 96))
+        png.seek(0)
+        return width * 96 / x_dpi, height * 96 / y_dpi
+    
+    def _add_charts_to_excel(self, workbook, chart_images: Tuple[io.BytesIO, io.BytesIO], month_name: str):
+        """Add charts to Excel sheet, each shown at 800x400 pixels."""
+        chart_sheet = workbook.add_worksheet(f"{month_name}_Charts")
+        
+        # Add dots chart at A1 and bars chart at A25
+        for cell, image in zip(('A1', 'A25'), chart_images):
+            img_width, img_height = self._png_display_size(image)
+            chart_sheet.insert_image(cell, f'{month_name}_chart.png',
+                                     {'image_data': image, 'x_scale': 800 / img_width, 'y_scale': 400 / img_height})
+    
+    def _chart_station_months(self, months: Iterable[Dict], rain_data: Dict,
+                              monthly_summaries: List[Dict]) -> Iterator[Tuple[Dict, Tuple[io.BytesIO, io.BytesIO]]]:
+        """
+        Create charts and statistics for each month as it is read.
+        
+        The statistics are appended to monthly_summaries;
+        yields (month_info, chart_images) for export_station_to_excel.
+        """
+        for month_info in months:
+            chart_images = self.create_water_level_chart(month_info, rain_data)
+            
+            # Print summary statistics
+            df = month_info['dataframe']
+            threshold = month_info['threshold']
+            summary = self._monthly_statistics(month_info)
+            month_info['statistics'] = summary
+            monthly_summaries.append(summary)
+            
+            logger.info(f"  {month_info['month_name']}: {len(df)} readings, "
+                      f"{summary[f'High Water Level Readings (>{threshold}m)']} high readings "
+                      f"in {summary[f'High Water Level Events (>{threshold}m)']} events, "
+                      f"{summary[f'Total Hours Above {threshold}m']}h "
+                      f"{summary[f'Additional Minutes Above {threshold}m']}m above {threshold}m")
+            
+            yield month_info, chart_images
+            del df, month_info
+    
+    def process_station(self, station_id: str, station_config: Dict, rain_data: Dict) -> Optional[Dict]:
+        """
+        Analyze one station: chart and export every month, returning its summary results
+        (or None if the station had no data or failed).
+        """
+        try:
+            logger.info(f"\n{'='*50}")
+            logger.info(f"Processing station: {station_config['name']}")
+            logger.info(f"{'='*50}")
+            
+            # Process station data month by month: read, chart and write each
+            # month to Excel before the next one is loaded
+            monthly_summaries = []
+            months = self.process_station_csv(station_id, station_config)
+            excel_file = self.export_station_to_excel(
+                self._chart_station_months(months, rain_data, monthly_summaries)
+            )
+            
+            if not monthly_summaries:
+                logger.warning(f"No data found for station: {station_config['name']}")
+                return None
+            
+            logger.info(f"Completed analysis for {station_config['name']}")
+            
+            # Summary statistics only, not the measurements
+            return {
+                'station_name': station_config['name'],
+                'monthly_summaries': monthly_summaries,
+                'excel_file': excel_file
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing station {station_config['name']}: {str(e)}")
+            return None
     
     def analyze_all_stations(self):
-        """Analyze all enabled stations."""
+        """Analyze all enabled stations, one worker process per station."""
         logger.info("Starting analysis of all stations...")
         
         # Process rain data once for all stations
         rain_data = self.process_rain_data()
         
-        all_results = {}
-        
+        enabled_stations = []
         for station_id, station_config in self.stations.items():
             if not station_config.get('enabled', True):
                 logger.info(f"Skipping disabled station: {station_config['name']}")
                 continue
-            
-            try:
-                logger.info(f"\n{'='*50}")
-                logger.info(f"Processing station: {station_config['name']}")
-                logger.info(f"{'='*50}")
-                
-                # Process station data
-                monthly_data = self.process_station_csv(station_id, station_config)
-                
-                if not monthly_data:
-                    logger.warning(f"No data found for station: {station_config['name']}")
-                    continue
-                
-                # Create charts for each month
-                chart_paths = []
-                for month_info in monthly_data:
-                    dots_path, bars_path = self.create_water_level_chart(month_info, rain_data)
-                    chart_paths.append((dots_path, bars_path))
-                    
-                    # Print summary statistics
-                    df = month_info['dataframe']
-                    level_column = month_info['level_column']
-                    threshold = month_info['threshold']
-                    high_level_df = df[df[level_column] > threshold]
-                    
-                    num_high_readings = len(high_level_df)
-                    total_minutes = num_high_readings * 5
-                    hours = total_minutes // 60
-                    remaining_minutes = total_minutes % 60
-                    
-                    logger.info(f"  {month_info['month_name']}: {len(df)} readings, "
-                              f"{num_high_readings} high readings, "
-                              f"{hours}h {remaining_minutes}m above {threshold}m")
-                
-                # Export to Excel
-                excel_file = self.export_station_to_excel(monthly_data, chart_paths)
-                
-                # Store results
-                all_results[station_id] = {
-                    'station_name': station_config['name'],
-                    'monthly_data': monthly_data,
-                    'chart_paths': chart_paths,
-                    'excel_file': excel_file
-                }
-                
-                # Clean up temporary chart files
-                for chart_path_tuple in chart_paths:
-                    try:
-                        os.remove(chart_path_tuple[0])
-                        os.remove(chart_path_tuple[1])
-                    except:
-                        pass
-                
-                logger.info(f"Completed analysis for {station_config['name']}")
-                
-            except Exception as e:
-                logger.error(f"Error processing station {station_config['name']}: {str(e)}")
-                continue
+            enabled_stations.append((station_id, station_config))
+        
+        all_results = {}
+        
+        if enabled_stations:
+            # Stations are independent; the rain data is handed to each worker once
+            max_workers = min(8, os.cpu_count() or 1, len(enabled_stations))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_station_worker,
+                                     initargs=(rain_data,)) as executor:
+                futures = [(station_id, executor.submit(_process_one_station, self, station_id, station_config))
+                           for station_id, station_config in enabled_stations]
+                # Collect in configuration order
+                for station_id, future in futures:
+                    result = future.result()
+                    if result is not None:
+                        all_results[station_id] = result
         
         logger.info(f"\n{'='*50}")
         logger.info("Analysis completed!")
@@ -497,6 +622,18 @@ class WaterStationAnalyzer:
         
         return all_results
 
+# Rain data shared by every station processed in a worker process (set by the pool initializer)
+_worker_rain_data: Dict = {}
+
+def _init_station_worker(rain_data: Dict):
+    """Store the parsed rain data once per worker process."""
+    global _worker_rain_data
+    _worker_rain_data = rain_data
+
+def _process_one_station(analyzer: WaterStationAnalyzer, station_id: str, station_config: Dict) -> Optional[Dict]:
+    """Worker entry point: analyze one station with the worker's rain data."""
+    return analyzer.process_station(station_id, station_config, _worker_rain_data)
+
 def main():
     """Main function to run the water station analysis."""
     analyzer = WaterStationAnalyzer()
@@ -509,7 +646,7 @@ def main():
     for station_id, result in results.items():
         print(f"\n{result['station_name']}:")
         print(f"  Excel file: {result['excel_file']}")
-        print(f"  Months processed: {len(result['monthly_data'])}")
+        print(f"  Months processed: {len(result['monthly_summaries'])}")
 
 if __name__ == "__main__":
     main()
@@ -1,99 +1,150 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import networkx as nx
+from matplotlib.collections import LineCollection
 import os
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, walk_chains then runs as plain Python
+    njit = None
+
+def build_adjacency(pipes_dataframe):
+    """
+    Builds a CSR adjacency of the pipe network from the pipes table.
+    Returns (labels, indptr, indices, edge_ids, degree) as NumPy arrays; the
+    neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+    """
+    ends = pd.concat([pipes_dataframe['Start Node'], pipes_dataframe['Stop Node']], ignore_index=True)
+    codes, labels = pd.factorize(ends)
+    edges = codes.reshape(2, -1).T
+    # Drop pipes with a missing node and collapse duplicates (undirected simple graph)
+    edges = edges[(edges >= 0).all(axis=1)]
+    edges = np.unique(np.sort(edges, axis=1), axis=0)
+
+    n_nodes, n_edges = len(labels), len(edges)
+    src = np.concatenate([edges[:, 0], edges[:, 1]])
+    dst = np.concatenate([edges[:, 1], edges[:, 0]])
+    eid = np.concatenate([np.arange(n_edges), np.arange(n_edges)])
+    order = np.argsort(src, kind='stable')
+
+    degree = np.bincount(src, minlength=n_nodes)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    return np.asarray(labels), indptr, dst[order], eid[order], degree
+
+def walk_chains(indptr, indices, edge_ids, degree, critical):
+    """
+    Follows every chain of degree-2 manholes leaving a critical node and marks
+    one manhole in every four along it. Returns a boolean mask over the nodes.
+    Only loops over integer arrays, so it is JIT-compiled when numba is installed.
+    """
+    keep = np.zeros(len(degree), dtype=np.bool_)
+    visited = np.zeros(len(edge_ids) // 2, dtype=np.bool_)
+    for node in critical:
+        for slot in range(indptr[node], indptr[node + 1]):
+            curr = indices[slot]
+            edge = edge_ids[slot]
+            if degree[curr] != 2 or visited[edge]:
+                continue
+            i = 0
+            while degree[curr] == 2:
+                visited[edge] = True
+                if i % 4 == 0:
+                    keep[curr] = True
+                i += 1
+                # Leave curr through the edge we did not arrive on
+                nxt = indptr[curr]
+                if edge_ids[nxt] == edge:
+                    nxt += 1
+                edge = edge_ids[nxt]
+                curr = indices[nxt]
+            visited[edge] = True
+    return keep
+
+if njit is not None:
+    walk_chains = njit(cache=True)(walk_chains)
+
 def identify_necessary_manholes(pipes_dataframe):
     """
     Identifies necessary manholes based on connectivity and sampling rules.
-    Returns a set of necessary manhole labels.
+    Returns (necessary_codes, labels): the integer codes of the necessary manholes
+    and the array of node labels those codes index.
     """
     print("\n" + "="*50)
     print("IDENTIFYING MANHOLES TO DISPLAY")
     print("="*50)
 
-    # Create a graph to understand the network structure
-    G = nx.from_pandas_edgelist(pipes_dataframe, 'Start Node', 'Stop Node')
-    print(f"Graph created with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges.")
+    # Build the network structure as integer CSR arrays
+    labels, indptr, indices, edge_ids, degree = build_adjacency(pipes_dataframe)
+    print(f"Graph created with {len(labels)} nodes and {len(edge_ids) // 2} edges.")
 
-    if G.number_of_nodes() == 0:
-        return set()
+    if len(labels) == 0:
+        return np.array([], dtype=np.int64), labels
 
     # Step 1: Identify "critical" manholes (endpoints and intersections)
-    necessary_mh = {node for node, degree in G.degree() if degree != 2}
-    print(f"Found {len(necessary_mh)} critical manholes (intersections/endpoints).")
+    critical = np.flatnonzero(degree != 2)
+    print(f"Found {len(critical)} critical manholes (intersections/endpoints).")
 
     # Step 2: Apply the "keep one, skip three" rule for long chains
-    visited_chains = set()
-    additional_mh = set()  # Store additional manholes to add later
-    
-    for node in necessary_mh:
-        for neighbor in G.neighbors(node):
-            if G.degree(neighbor) == 2 and tuple(sorted((node, neighbor))) not in visited_chains:
-                chain = []
-                prev, curr = node, neighbor
-                while G.degree(curr) == 2:
-                    chain.append(curr)
-                    visited_chains.add(tuple(sorted((prev, curr))))
-                    next_node_options = [n for n in G.neighbors(curr) if n != prev]
-                    if not next_node_options: break
-                    next_node = next_node_options[0]
-                    prev, curr = curr, next_node
-                visited_chains.add(tuple(sorted((prev, curr))))
-                
-                if chain:
-                    for i, chain_node in enumerate(chain):
-                        if i % 4 == 0:
-                            additional_mh.add(chain_node)
-    
-    # Add the additional manholes to the necessary set
-    necessary_mh.update(additional_mh)
+    keep = walk_chains(indptr, indices, edge_ids, degree, critical)
+    keep[critical] = True
+    necessary_codes = np.flatnonzero(keep)
 
-    print(f"Total manholes to display after applying chain rule: {len(necessary_mh)}")
-    return necessary_mh
+    print(f"Total manholes to display after applying chain rule: {len(necessary_codes)}")
+    return necessary_codes, labels
 
-def create_and_save_plot(title, filename, save_path, plot_pipes_df, plot_mh_df, all_mh_df):
+def create_and_save_plot(title, filename, save_path, plot_pipes_df, plot_mh_df, coord_df):
     """
     Creates and saves a network plot.
     - Pipes are drawn from plot_pipes_df.
     - Manhole dots are drawn from plot_mh_df.
-    - all_mh_df is used for coordinate lookups.
+    - coord_df (X/Y indexed by manhole label) is used for coordinate lookups.
     """
     print(f"\nCreating plot: {title}...")
-    mh_coords = {row['Label']: (row['X (m)'], row['Y (m)']) for _, row in all_mh_df.iterrows()}
     
-    plt.figure(figsize=(20, 16))
+    fig, ax = plt.subplots(figsize=(20, 16))
     
-    # Plot Pipes
-    for _, pipe in plot_pipes_df.iterrows():
-        start_node, stop_node = pipe['Start Node'], pipe['Stop Node']
-        if start_node in mh_coords and stop_node in mh_coords:
-            x1, y1 = mh_coords[start_node]
-            x2, y2 = mh_coords[stop_node]
-            plt.plot([x1, x2], [y1, y2], 'r-', linewidth=0.7, alpha=0.8)
+    # Plot Pipes as a single LineCollection, skipping pipes with an unknown manhole
+    starts = coord_df.reindex(plot_pipes_df['Start Node']).values
+    stops = coord_df.reindex(plot_pipes_df['Stop Node']).values
+    mask = ~(np.isnan(starts).any(axis=1) | np.isnan(stops).any(axis=1))
+    segments = np.stack([starts[mask], stops[mask]], axis=1)
+    ax.add_collection(LineCollection(segments, colors='r', linewidths=0.7, alpha=0.8))
+    ax.autoscale()
 
     # Plot Manholes (the dots)
-    mh_to_plot_labels = set(plot_mh_df['Label'])
-    mh_x = [mh_coords[label][0] for label in mh_to_plot_labels if label in mh_coords]
-    mh_y = [mh_coords[label][1] for label in mh_to_plot_labels if label in mh_coords]
-    plt.scatter(mh_x, mh_y, c='darkred', s=1, zorder=5)
-
-    plt.title(title, fontsize=16, fontweight='bold')
-    plt.xlabel('X Coordinate (m)', fontsize=12)
-    plt.ylabel('Y Coordinate (m)', fontsize=12)
-    plt.grid(True, alpha=0.3)
-    plt.axis('equal')
+    mh_xy = coord_df.reindex(plot_mh_df['Label'].unique()).dropna().values
+    ax.scatter(mh_xy[:, 0], mh_xy[:, 1], c='darkred', s=1, zorder=5)
+
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_xlabel('X Coordinate (m)', fontsize=12)
+    ax.set_ylabel('Y Coordinate (m)', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.axis('equal')
     
     stats_text = f'Total Pipes: {len(plot_pipes_df)}\nManholes Displayed: {len(plot_mh_df)}'
-    plt.figtext(0.02, 0.02, stats_text, fontsize=10, bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray", alpha=0.8))
+    fig.text(0.02, 0.02, stats_text, fontsize=10, bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray", alpha=0.8))
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     full_path = os.path.join(save_path, filename)
-    plt.savefig(full_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(full_path, dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print(f"Successfully saved '{filename}'")
 
+def _cached(path_csv):
+    """
+    Reads a CSV file, caching the parsed table as a zstd-compressed Parquet file next to it.
+    The cache is reused while it is at least as new as the CSV.
+    """
+    path_pq = os.path.splitext(path_csv)[0] + '.parquet'
+    if os.path.exists(path_pq) and os.path.getmtime(path_pq) >= os.path.getmtime(path_csv):
+        return pd.read_parquet(path_pq)
+    df = pd.read_csv(path_csv)
+    df.to_parquet(path_pq, compression='zstd')
+    return df
+
 def main():
     """Main function to run the entire pipeline."""
     # --- CHANGE: Use os.path.join for robust file paths ---
@@ -101,8 +152,8 @@ def main():
     pipes_path = os.path.join(base_path, "ofakim pipe data 01.csv")
     mh_path = os.path.join(base_path, "ofakim MH data 01.csv")
 
-    pipes_df = pd.read_csv(pipes_path)
-    mh_df = pd.read_csv(mh_path)
+    pipes_df = _cached(pipes_path)
+    mh_df = _cached(mh_path)
 
     print("Original DataFrames loaded successfully.")
     print(f"Pipes: {len(pipes_df)}, Manholes: {len(mh_df)}")
@@ -110,13 +161,17 @@ def main():
     # --- CHANGE 1: This is the primary logical fix. ---
     # The simplification is now purely for deciding which manholes to DISPLAY.
     # The pipe geometry is always taken from the original data.
-    necessary_mh_labels = identify_necessary_manholes(pipes_df)
-    simplified_mh_df = mh_df[mh_df['Label'].isin(necessary_mh_labels)].copy()
+    necessary_codes, node_labels = identify_necessary_manholes(pipes_df)
+    simplified_mh_df = mh_df[mh_df['Label'].isin(node_labels[necessary_codes])].copy()
 
     # Save the original pipes data (with all columns)
+    # (skipped when the copy is already newer than the input CSV)
     original_pipes_path = os.path.join(base_path, "original_pipes.csv")
-    pipes_df.to_csv(original_pipes_path, index=False)
-    print(f"Saved original pipes data to: {original_pipes_path}")
+    if not os.path.exists(original_pipes_path) or os.path.getmtime(original_pipes_path) < os.path.getmtime(pipes_path):
+        pipes_df.to_csv(original_pipes_path, index=False)
+        print(f"Saved original pipes data to: {original_pipes_path}")
+    else:
+        print(f"Original pipes data is up to date: {original_pipes_path}")
     
     # Save the list of simplified manholes
     simplified_mh_path = os.path.join(base_path, "simplified_manholes.csv")
@@ -124,9 +179,12 @@ def main():
     print(f"Saved simplified manholes data to: {simplified_mh_path}")
     
     # Create simplified pipes data (filter pipes that connect to simplified manholes)
+    # Compare integer node codes instead of hashing the label objects
+    start_codes = pd.Categorical(pipes_df['Start Node'], categories=node_labels).codes
+    stop_codes = pd.Categorical(pipes_df['Stop Node'], categories=node_labels).codes
     simplified_pipes_df = pipes_df[
-        (pipes_df['Start Node'].isin(necessary_mh_labels)) & 
-        (pipes_df['Stop Node'].isin(necessary_mh_labels))
+        np.isin(start_codes, necessary_codes) & 
+        np.isin(stop_codes, necessary_codes)
     ].copy()
     
     # Save the simplified pipes data (with all original columns)
@@ -135,6 +193,9 @@ def main():
     print(f"Saved simplified pipes data to: {simplified_pipes_path}")
 
     # --- PLOTTING ---
+    # Label -> (X, Y) lookup shared by both plots; last row wins on duplicate labels
+    coord_df = mh_df.drop_duplicates('Label', keep='last').set_index('Label')[['X (m)', 'Y (m)']]
+
     # Plot 1: Original Network (All pipes, all manholes)
     create_and_save_plot(
         title='ORIGINAL Sewage Pipe Network - Ofakim',
@@ -142,7 +203,7 @@ def main():
         save_path=base_path,
         plot_pipes_df=pipes_df,
         plot_mh_df=mh_df,
-        all_mh_df=mh_df
+        coord_df=coord_df
     )
 
     # Plot 2: Simplified Network (All pipes, selected manholes)
@@ -152,7 +213,7 @@ def main():
         save_path=base_path,
         plot_pipes_df=pipes_df, # IMPORTANT: We use the ORIGINAL pipes for geometry
         plot_mh_df=simplified_mh_df, # But the SIMPLIFIED manholes for dots
-        all_mh_df=mh_df
+        coord_df=coord_df
     )
     
     print("\n" + "="*50)
@@ -4,73 +4,92 @@ XY Automation Script
 A Python script for automating XY coordinate operations.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import requests
-import time
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pyproj
 
-def get_elevation_from_coordinates(lat: float, lon: float) -> Optional[float]:
+OPEN_ELEVATION_URL = "https://api.open-elevation.com/api/v1/lookup"
+ELEVATION_BATCH_SIZE = 256
+ELEVATION_WORKERS = 4  # concurrent batch requests, one pooled connection each
+
+# ITM -> WGS84 transformer, built once; always_xy=True gives (x, y) in and (lon, lat) out
+_XY_TO_LATLON = pyproj.Transformer.from_crs("EPSG:2039", "EPSG:4326", always_xy=True)
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session that keeps connections alive and retries
+    transient Open-Elevation failures with backoff.
     """
-    Get elevation data from Open-Elevation API for given coordinates.
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset({'GET', 'POST'}))
+    adapter = HTTPAdapter(pool_connections=ELEVATION_WORKERS, pool_maxsize=ELEVATION_WORKERS, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_elevations_batch(session: requests.Session, lats, lons) -> np.ndarray:
+    """
+    Get elevations for many coordinates with a single Open-Elevation POST request.
     
     Args:
-        lat: Latitude in decimal degrees
-        lon: Longitude in decimal degrees
+        session: Session used for the request
+        lats: Latitudes in decimal degrees
+        lons: Longitudes in decimal degrees
     
     Returns:
-        Elevation in meters or None if failed
+        Array of elevations in meters, NaN where no elevation was returned
     """
+    locations = [{"latitude": float(lat), "longitude": float(lon)} for lat, lon in zip(lats, lons)]
+    elevations = np.full(len(locations), np.nan)
     try:
-        # Using Open-Elevation API
-        url = f"https://api.open-elevation.com/api/v1/lookup?locations={lat},{lon}"
-        
-        response = requests.get(url, timeout=10)
+        response = session.post(OPEN_ELEVATION_URL, json={"locations": locations}, timeout=60)
         response.raise_for_status()
         
-        data = response.json()
-        if data.get('results') and len(data['results']) > 0:
-            elevation = data['results'][0].get('elevation')
+        results = response.json().get('results') or []
+        for i, result in enumerate(results[:len(locations)]):
+            elevation = result.get('elevation')
             if elevation is not None:
-                return float(elevation)
-        
-        return None
+                elevations[i] = float(elevation)
         
     except Exception as e:
-        print(f"Error getting elevation for coordinates ({lat}, {lon}): {e}")
-        return None
+        print(f"Error getting elevations for {len(locations)} coordinates: {e}")
+    
+    return elevations
 
-def convert_xy_to_latlon(x: float, y: float, source_epsg: str = "EPSG:2039", target_epsg: str = "EPSG:4326") -> tuple[float, float]:
+def convert_xy_to_latlon(x, y, source_epsg: str = "EPSG:2039", target_epsg: str = "EPSG:4326") -> tuple:
     """
     Convert X,Y coordinates from source CRS to latitude/longitude.
     
     Args:
-        x: X coordinate in meters
-        y: Y coordinate in meters
+        x: X coordinate(s) in meters, a scalar or an array
+        y: Y coordinate(s) in meters, a scalar or an array
         source_epsg: Source coordinate reference system (default: EPSG:2039 - ITM)
         target_epsg: Target coordinate reference system (default: EPSG:4326 - WGS84)
     
     Returns:
         Tuple of (latitude, longitude) in decimal degrees
     """
-    try:
-        # Create transformer with always_xy=True to ensure consistent x,y order
+    # Building a transformer is costly, so the ITM -> WGS84 one is shared;
+    # always_xy=True ensures consistent x,y order
+    if (source_epsg, target_epsg) == ("EPSG:2039", "EPSG:4326"):
+        transformer = _XY_TO_LATLON
+    else:
         transformer = pyproj.Transformer.from_crs(source_epsg, target_epsg, always_xy=True)
-        
-        # Transform coordinates - returns (lon, lat) due to always_xy=True
-        lon, lat = transformer.transform(x, y)
-        
-        # Return (lat, lon) as expected
-        return lat, lon
-        
-    except Exception as e:
-        print(f"Error converting coordinates ({x}, {y}): {e}")
-        # Fallback to rough approximation if conversion fails
-        return 40.0, -74.0
+    
+    # Transform coordinates - returns (lon, lat) due to always_xy=True
+    lon, lat = transformer.transform(x, y)
+    
+    # Return (lat, lon) as expected
+    return lat, lon
 
 def update_elevations(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Update the elevation column with data from API calls.
+    Update the elevation column with data from batched API calls.
     
     Args:
         df: DataFrame with X and Y coordinates
@@ -81,28 +100,36 @@ def update_elevations(df: pd.DataFrame) -> pd.DataFrame:
     print("Starting elevation data collection...")
     print("Using EPSG:2039 (ITM - Israel Transverse Mercator) coordinate system")
     
-    for index, row in df.iterrows():
-        x_coord = row['X (m)']
-        y_coord = row['Y (m)']
-        
-        # Convert XY to lat/lon
-        lat, lon = convert_xy_to_latlon(x_coord, y_coord)
-        
-        # Get elevation from API
-        elevation = get_elevation_from_coordinates(lat, lon)
-        
-        if elevation is not None:
-            df.at[index, 'Elevation (Ground) (m)'] = elevation
-            print(f"Row {index}: ({x_coord}, {y_coord}) -> ({lat:.6f}, {lon:.6f}) -> Elevation: {elevation}m")
-        else:
-            print(f"Row {index}: Failed to get elevation for ({x_coord}, {y_coord})")
-        
-        # Add delay to avoid overwhelming the API
-        time.sleep(0.1)
-        
-        # Progress indicator every 100 rows
-        if (index + 1) % 100 == 0:
-            print(f"Processed {index + 1}/{len(df)} rows...")
+    # Convert all XY coordinates to lat/lon in one call
+    lats, lons = convert_xy_to_latlon(df['X (m)'].to_numpy(dtype=float), df['Y (m)'].to_numpy(dtype=float))
+    lats, lons = np.asarray(lats), np.asarray(lons)
+    
+    # Only coordinates that converted cleanly are sent to the API
+    valid = np.flatnonzero(np.isfinite(lats) & np.isfinite(lons))
+    if len(valid) < len(df):
+        print(f"Skipping {len(df) - len(valid)} rows with missing or invalid coordinates")
+    
+    # Get elevations from the API, ELEVATION_BATCH_SIZE coordinates per request,
+    # with up to ELEVATION_WORKERS requests in flight on a shared session
+    elevations = np.full(len(df), np.nan)
+    batches = [valid[start:start + ELEVATION_BATCH_SIZE] for start in range(0, len(valid), ELEVATION_BATCH_SIZE)]
+    with create_session() as session, ThreadPoolExecutor(max_workers=ELEVATION_WORKERS) as executor:
+        results = executor.map(lambda rows: get_elevations_batch(session, lats[rows], lons[rows]), batches)
+        done = 0
+        for rows, batch_elevations in zip(batches, results):
+            elevations[rows] = batch_elevations
+            done += len(rows)
+            print(f"Processed {done}/{len(valid)} rows...")
+    
+    # Keep the existing value where no elevation was returned
+    elevations = pd.Series(elevations, index=df.index)
+    if 'Elevation (Ground) (m)' in df.columns:
+        elevations = elevations.fillna(df['Elevation (Ground) (m)'])
+    df['Elevation (Ground) (m)'] = elevations
+    
+    failed = int(elevations.isna().sum())
+    if failed:
+        print(f"Failed to get elevation for {failed}/{len(df)} rows")
     
     return df
 